@@ -0,0 +1,58 @@
+# The multi-threaded Monte Carlo kernel behind `sim.py --numba`, kept in its own module so numba only gets
+# imported when someone asks for it. cache=True keeps the compiled version in __pycache__, so only the first
+# run pays the JIT warm-up (numba recompiles by itself when this file changes).
+import numpy as np
+from numba import njit, prange
+
+# (means, credits, pastPoints, pastCr, extraC, extraG, targets, nSims, seed) -> (avg, best, probs, probsEx)
+@njit(parallel=True, fastmath=True, cache=True)
+def monteCarloKernel(means, credits, pastPoints, pastCr, extraC, extraG, targets, nSims, seed):
+    # same dice as the numpy path, but one sample at a time so no (S, N, F) tensor is ever built
+    nScen, nFuture = means.shape
+    nTargets = targets.shape[0]
+    totalCr = pastCr + credits.sum()
+    extraPts = extraC * extraG
+    invTotalCr = 1.0 / totalCr
+    invTotalCrEx = 1.0 / (totalCr + extraC)
+
+    # every chunk gets its own accumulators (and its own seed) so threads never step on each other
+    nChunks = max(1, min(nSims, 64))
+    chunkSize = (nSims + nChunks - 1) // nChunks
+    sums = np.zeros((nChunks, nScen))
+    maxs = np.full((nChunks, nScen), -np.inf)
+    hits = np.zeros((nChunks, nScen, nTargets), dtype=np.int64)
+    hitsEx = np.zeros((nChunks, nScen, nTargets), dtype=np.int64)
+
+    for c in prange(nChunks):
+        np.random.seed(seed + c)
+        noise = np.empty(nFuture)
+        for n in range(c * chunkSize, min(nSims, (c + 1) * chunkSize)):
+            # one set of dice per sim, shared by every scenario (only the means differ between them)
+            for f in range(nFuture):
+                noise[f] = 0.3 * np.random.standard_normal()
+            for s in range(nScen):
+                futurePts = 0.0
+                for f in range(nFuture):
+                    # truncated normal: fresh rolls until it lands inside [5, 10]
+                    sg = means[s, f] + noise[f]
+                    while sg < 5.0 or sg > 10.0:
+                        sg = means[s, f] + 0.3 * np.random.standard_normal()
+                    futurePts += sg * credits[f]
+                totalPts = pastPoints + futurePts
+                cgpa = totalPts * invTotalCr
+                cgpaEx = (totalPts + extraPts) * invTotalCrEx
+                sums[c, s] += cgpa
+                maxs[c, s] = max(maxs[c, s], cgpa)
+                for t in range(nTargets):
+                    if cgpa >= targets[t]:
+                        hits[c, s, t] += 1
+                    if cgpaEx >= targets[t]:
+                        hitsEx[c, s, t] += 1
+
+    avg = sums.sum(axis=0) / nSims
+    best = np.full(nScen, -np.inf)
+    for c in range(nChunks):
+        best = np.maximum(best, maxs[c])
+    probs = hits.sum(axis=0) * 100.0 / nSims
+    probsEx = hitsEx.sum(axis=0) * 100.0 / nSims
+    return avg, best, probs, probsEx
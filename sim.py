@@ -1,11 +1,13 @@
 import numpy as np
-import pandas as pd
 import json
 import os
 import sys
 import argparse
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import List, Optional, Tuple
+
+# how many Monte Carlo sims the numpy path chews through at once (keeps the scratch tensor cache sized)
+MC_CHUNK = 4096
 
 # Just some colors to make the terminal look less depressing
 class Color:
@@ -20,6 +22,12 @@ class Color:
     def print(text, color=END):
         print(f"{color}{text}{Color.END}")
 
+# pre-baked "{color}{text}{END}" templates, so colouring something is one call instead of a fresh f-string every time
+GREEN_FMT = (Color.GREEN + "{}" + Color.END).format
+YELLOW_FMT = (Color.YELLOW + "{}" + Color.END).format
+RED_FMT = (Color.RED + "{}" + Color.END).format
+OVER_TEN = RED_FMT("> 10.0")
+
 # --- Data Structures ---
 
 @dataclass
@@ -30,8 +38,9 @@ class Semester:
 
 @dataclass
 class StudentProfile:
-    # storing semesters in a map because O(1) > O(n) or something
-    semesters: Dict[int, Semester] = field(default_factory=dict)
+    # parallel arrays indexed by sem - 1 instead of a map of Semester objects, NaN sgpa = still in the mystery box
+    credits: np.ndarray = field(default_factory=lambda: np.empty(0))
+    sgpa: np.ndarray = field(default_factory=lambda: np.empty(0))
     extraCredits: float = 0.0
     extraGrade: float = 10.0
     targets: List[float] = field(default_factory=lambda: [8.5, 9.0])
@@ -39,8 +48,8 @@ class StudentProfile:
     def toDict(self):
         return {
             "semesters": {
-                k: {"credits": v.credits, "sgpa": v.sgpa} 
-                for k, v in self.semesters.items()
+                i + 1: {"credits": float(cr), "sgpa": None if np.isnan(sg) else float(sg)}
+                for i, (cr, sg) in enumerate(zip(self.credits, self.sgpa))
             },
             "extraCredits": self.extraCredits,
             "extraGrade": self.extraGrade,
@@ -50,46 +59,81 @@ class StudentProfile:
     @staticmethod
     def fromDict(data):
         profile = StudentProfile()
-        for k, v in data["semesters"].items():
-            profile.semesters[int(k)] = Semester(int(k), v["credits"], v["sgpa"])
+        # straight into the arrays, no Semester objects, then put the semesters back in order
+        sems = data["semesters"]
+        ids = np.fromiter((int(k) for k in sems), dtype=np.int32, count=len(sems))
+        order = np.argsort(ids, kind="stable")
+        profile.credits = np.fromiter((v["credits"] for v in sems.values()), dtype=np.float64, count=len(sems))[order]
+        profile.sgpa = np.fromiter((np.nan if v["sgpa"] is None else v["sgpa"] for v in sems.values()),
+                                   dtype=np.float64, count=len(sems))[order]
         profile.extraCredits = data.get("extraCredits", 0.0)
         profile.extraGrade = data.get("extraGrade", 10.0)
         profile.targets = data.get("targets", [8.5, 9.0])
         return profile
 
-    @property
-    def completedSems(self):
-        # returns the semesters where you actually laid down your cards
-        return [s for s in self.semesters.values() if s.sgpa is not None]
+    @staticmethod
+    def fromSemesters(semesters: List[Semester]):
+        # the interactive setup still thinks in Semester objects, so flatten them into the arrays here
+        profile = StudentProfile()
+        sems = sorted(semesters, key=lambda sem: sem.id)
+        profile.credits = np.array([sem.credits for sem in sems], dtype=np.float64)
+        profile.sgpa = np.array([np.nan if sem.sgpa is None else sem.sgpa for sem in sems], dtype=np.float64)
+        return profile
+
+    def __eq__(self, other):
+        # the generated __eq__ would compare the arrays elementwise and choke, so compare them whole (NaN == NaN here)
+        if not isinstance(other, StudentProfile):
+            return NotImplemented
+        return (np.array_equal(self.credits, other.credits)
+                and np.array_equal(self.sgpa, other.sgpa, equal_nan=True)
+                and self.extraCredits == other.extraCredits
+                and self.extraGrade == other.extraGrade
+                and self.targets == other.targets)
 
     @property
-    def futureSems(self):
-        # returns the semesters that are still haunting your dreams
-        return [s for s in self.semesters.values() if s.sgpa is None]
+    def doneMask(self):
+        # True for the semesters where you actually laid down your cards
+        return ~np.isnan(self.sgpa)
 
 # --- Interactive Setup ---
+def _stdinReader():
+    # a real terminal keeps plain input(), but piped/scripted answers get slurped in one read
+    # (line by line, since the targets answer is a comma separated list with spaces in it)
+    if sys.stdin.isatty():
+        return input
+    lines = iter(sys.stdin.read().splitlines())
+
+    def ask(prompt=""):
+        print(prompt, end="")
+        line = next(lines, None)
+        if line is None: raise EOFError
+        return line
+
+    return ask
+
 def interactiveSetup() -> StudentProfile:
     Color.print("\n=== CGPA Predictor Setup ===", Color.CYAN)
-    profile = StudentProfile()
+    ask = _stdinReader()
+    semesters = []
     
     # figuring out the past damage
     while True:
         try:
-            nDone = int(input("How many semesters have you survived so far? "))
+            nDone = int(ask("How many semesters have you survived so far? "))
             break
         except ValueError:
             pass
             
     for i in range(1, nDone + 1):
         print(f"\n--- Semester {i} ---")
-        cr = float(input(f"Credits for Sem {i}: "))
-        sg = float(input(f"SGPA for Sem {i}: "))
-        profile.semesters[i] = Semester(i, cr, sg)
+        cr = float(ask(f"Credits for Sem {i}: "))
+        sg = float(ask(f"SGPA for Sem {i}: "))
+        semesters.append(Semester(i, cr, sg))
 
     # figuring out the future struggle
     while True:
         try:
-            nFuture = int(input("\nHow many semesters related to torture are left? "))
+            nFuture = int(ask("\nHow many semesters related to torture are left? "))
             break
         except ValueError:
             pass
@@ -97,54 +141,145 @@ def interactiveSetup() -> StudentProfile:
     startSem = nDone + 1
     for i in range(startSem, startSem + nFuture):
         print(f"\n--- Semester {i} (Future) ---")
-        cr = float(input(f"Credits for Sem {i}: "))
-        profile.semesters[i] = Semester(i, cr, None)
+        cr = float(ask(f"Credits for Sem {i}: "))
+        semesters.append(Semester(i, cr, None))
+
+    profile = StudentProfile.fromSemesters(semesters)
 
     # checking for free lunches (extra credits)
-    ans = input("\nDo you have extra credits (clubs, yoga, touching grass)? (y/n): ").lower()
+    ans = ask("\nDo you have extra credits (clubs, yoga, touching grass)? (y/n): ").lower()
     if ans == 'y':
-        profile.extraCredits = float(input("Total Extra Credits: "))
-        profile.extraGrade = float(input("Grade point for these (usually 10, don't lie): "))
+        profile.extraCredits = float(ask("Total Extra Credits: "))
+        profile.extraGrade = float(ask("Grade point for these (usually 10, don't lie): "))
 
     # setting the impossible goals
-    tInput = input("\nEnter target CGPAs (comma separated, e.g., '8.5, 9.0'): ")
+    tInput = ask("\nEnter target CGPAs (comma separated, e.g., '8.5, 9.0'): ")
     profile.targets = [float(x.strip()) for x in tInput.split(",")]
 
     return profile
 
+# --- Numba Kernel ---
+_monteCarloKernel = None
+
+def _loadKernel():
+    # numba is optional (and slow to import), so it only gets pulled in when the kernel is actually asked for.
+    # returns the parallel njit kernel (numba's on-disk cache skips recompiling it on later runs, and notices
+    # when cgpa_kernel.py changes), or False if numba isn't around and we fall back to plain numpy
+    global _monteCarloKernel
+    if _monteCarloKernel is None:
+        try:
+            import cgpa_kernel
+            _monteCarloKernel = cgpa_kernel.monteCarloKernel
+        except ImportError:
+            _monteCarloKernel = False
+    return _monteCarloKernel
+
 # --- Simulation Logic ---
 class Simulator:
     def __init__(self, profile: StudentProfile):
         self.profile = profile
         
         # let's crunch the numbers from the past
-        self.pastCreditsArr = np.array([s.credits for s in profile.completedSems])
-        self.pastScoresArr = np.array([s.sgpa for s in profile.completedSems])
-        self.pastPoints = np.sum(self.pastCreditsArr * self.pastScoresArr)
-        self.pastTotalCredits = np.sum(self.pastCreditsArr)
+        # (float32 is plenty for grades and halves the memory traffic, the totals are still summed in float64)
+        done = profile.doneMask
+        self.pastCreditsArr = profile.credits[done].astype(np.float32)
+        self.pastScoresArr = profile.sgpa[done].astype(np.float32)
+        self.pastPoints = np.sum(self.pastCreditsArr * self.pastScoresArr, dtype=np.float64)
+        self.pastTotalCredits = np.sum(self.pastCreditsArr, dtype=np.float64)
         
         # prepping for the future
-        self.futureCreditsArr = np.array([s.credits for s in profile.futureSems])
-        self.futureTotalCredits = np.sum(self.futureCreditsArr)
-        self.nFuture = len(profile.futureSems)
+        self.futureCreditsArr = profile.credits[~done].astype(np.float32)
+        self.futureTotalCredits = np.sum(self.futureCreditsArr, dtype=np.float64)
+        self.nFuture = len(self.futureCreditsArr)
+        
+        # PCG64 is quicker than the old global Mersenne Twister, and the buffer gets reused between runs
+        self._rng = np.random.default_rng()
+        self._noiseBuf = None
+        self._scratchBuf = None
+        
+        # stuff that doesn't care which scenario we're in, worked out once (plain floats so float32 arrays stay float32)
+        self._totalCr = float(self.pastTotalCredits + self.futureTotalCredits)
+        self._extraPoints = float(profile.extraCredits * profile.extraGrade)
+        self._totalCrEx = self._totalCr + profile.extraCredits
+        self._invTotalCr = 1.0 / self._totalCr if self._totalCr else float("inf")
+        self._invTotalCrEx = 1.0 / self._totalCrEx if self._totalCrEx else float("inf")
 
     def calculateRequiredAverage(self, target, useExtra=False):
-        # calculate exactly how much sleep you need to lose to hit the target
-        finalCredits = self.pastTotalCredits + self.futureTotalCredits
-        finalPointsOffset = 0
+        # calculate exactly how much sleep you need to lose to hit the target (single target flavour of the one below)
+        req, reqEx = self.calculateRequiredAverages([target])
+        return float(reqEx[0] if useExtra else req[0])
+
+    def calculateRequiredAverages(self, targets: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        # math time: solving for X (the average required) for every target at once -> (base, withExtra)
+        targets = np.asarray(targets, dtype=np.float64)
+        if self.futureTotalCredits == 0: return np.zeros_like(targets), np.zeros_like(targets)
         
-        if useExtra:
-            finalCredits += self.profile.extraCredits
-            finalPointsOffset = self.profile.extraCredits * self.profile.extraGrade
+        req = (targets * self._totalCr - self.pastPoints) / self.futureTotalCredits
+        reqEx = (targets * self._totalCrEx - self.pastPoints - self._extraPoints) / self.futureTotalCredits
+        return req, reqEx
 
-        # math time: solving for X where X is the average required
-        neededFuturePts = (target * finalCredits) - self.pastPoints - finalPointsOffset
+    def _runNumpy(self, means, targets, nSims):
+        # the vectorized fallback when numba isn't around, returns (avg, max, probs, probsEx) per scenario
+        nScen = means.shape[0]
+        
+        # rolling the dice MC_CHUNK sims at a time so the scratch tensor stays in cache however big nSims gets.
+        # laid out as (S, N, F) so the per-sim weighted sum runs along the contiguous inner axis
+        nFuture = self.nFuture
+        chunk = max(1, min(nSims, MC_CHUNK))
+        shape = (nScen, chunk, nFuture)
+        if self._scratchBuf is None or self._scratchBuf.shape != shape:
+            self._scratchBuf = np.empty(shape, dtype=np.float32)
+            self._noiseBuf = np.empty((chunk, nFuture), dtype=np.float32)
+        flatMeans = means.reshape(-1)
+        
+        sums = np.zeros(nScen)
+        best = np.full(nScen, -np.inf, dtype=np.float32)
+        hits = np.zeros((nScen, len(targets)), dtype=np.int64)
+        hitsEx = np.zeros((nScen, len(targets)), dtype=np.int64)
         
-        if self.futureTotalCredits == 0: return 0.0
-        return neededFuturePts / self.futureTotalCredits
+        for start in range(0, nSims, chunk):
+            n = min(chunk, nSims - start)
+            # contiguous views on the front of the buffers, so the last short chunk still works in place
+            noise = self._noiseBuf.reshape(-1)[:n * nFuture].reshape(n, nFuture)
+            simSgpas = self._scratchBuf.reshape(-1)[:nScen * n * nFuture].reshape(nScen, n, nFuture)
+            
+            # the noise doesn't care which scenario it lands in, so roll one (n, F) batch and share it across all of them
+            self._rng.standard_normal(dtype=np.float32, out=noise)
+            np.multiply(noise, 0.3, out=noise)
+            np.add(means[:, None, :], noise[None, :, :], out=simSgpas)
+            
+            # truncated normal instead of clipping (no pile-up at 5 and 10): only re-roll the few that escaped [5, 10]
+            flat = simSgpas.reshape(-1)
+            idx = np.flatnonzero((flat < 5.0) | (flat > 10.0))
+            while idx.size:
+                draws = flatMeans[(idx // (n * nFuture)) * nFuture + idx % nFuture] + 0.3 * self._rng.standard_normal(idx.size, dtype=np.float32)
+                flat[idx] = draws
+                idx = idx[(draws < 5.0) | (draws > 10.0)]
+            
+            # calculating the weighted average, (S, n, F) @ (F,) -> (S, n) as one BLAS pass with no product temporary
+            futurePts = simSgpas @ self.futureCreditsArr
+            
+            # base CGPA without the extra seasoning (multiplying by the hoisted reciprocals, no divides per sample)
+            totalPts = np.add(futurePts, float(self.pastPoints), out=futurePts)
+            cgpaBase = totalPts * self._invTotalCr
+            
+            # CGPA with the extra bits, reusing the points buffer in place instead of allocating more temporaries
+            cgpaEx = np.add(totalPts, self._extraPoints, out=totalPts)
+            np.multiply(cgpaEx, self._invTotalCrEx, out=cgpaEx)
+            
+            # tallying successes vs despair, one (S, T, n) sweep for every target at once (counting bits, no float upcast)
+            hits += np.count_nonzero(cgpaBase[:, None, :] >= targets[None, :, None], axis=-1)
+            hitsEx += np.count_nonzero(cgpaEx[:, None, :] >= targets[None, :, None], axis=-1)
+            sums += cgpaBase.sum(axis=1, dtype=np.float64)
+            np.maximum(best, cgpaBase.max(axis=1), out=best)
+        
+        return sums / nSims, best, hits * 100.0 / nSims, hitsEx * 100.0 / nSims
 
-    def runMonteCarlo(self, nSims=5000):
-        # predicting the future by rolling dice 5000 times
+    def runMonteCarlo(self, nSims=5000, seed=None, useKernel=False):
+        # predicting the future by rolling dice 5000 times (pass a seed if you want the same future twice).
+        # numpy is the default; the numba kernel only beats it with several cores and lots of sims, so it's opt-in
+        if seed is not None:
+            self._rng = np.random.default_rng(seed)
         
         scenarios = {
             "Chill Mode (~8.0)": np.full(self.nFuture, 8.0),
@@ -159,50 +294,52 @@ class Simulator:
             mixed[0] = 9.2 # putting all eggs in the next basket
             scenarios["Push Next Sem Only"] = mixed
 
-        results = []
+        names = list(scenarios.keys())
+        means = np.stack(list(scenarios.values())).astype(np.float32) # (S, F), one row per scenario
 
         Color.print("\nRunning Monte Carlo Simulations (consulting the crystal ball)...", Color.YELLOW)
         
-        for name, means in scenarios.items():
-            # generating random outcomes because life is random
-            meansCol = means.reshape(self.nFuture, 1)
-            noise = np.random.normal(0, 0.3, (self.nFuture, nSims))
-            simSgpas = np.clip(meansCol + noise, 5.0, 10.0)
-            
-            # calculating the weighted average
-            futurePts = np.sum(simSgpas * self.futureCreditsArr.reshape(self.nFuture, 1), axis=0)
-            
-            # base CGPA without the extra seasoning
-            totalPts = self.pastPoints + futurePts
-            totalCr = self.pastTotalCredits + self.futureTotalCredits
-            cgpaBase = totalPts / totalCr
-            
-            # CGPA with the extra bits
-            totalPtsEx = totalPts + (self.profile.extraCredits * self.profile.extraGrade)
-            totalCrEx = totalCr + self.profile.extraCredits
-            cgpaEx = totalPtsEx / totalCrEx
-            
+        targets = np.asarray(self.profile.targets, dtype=np.float32) # built once, shared by both paths
+        kernel = _loadKernel() if useKernel else False
+        if useKernel and not kernel:
+            Color.print("numba isn't installed, sticking with plain numpy.", Color.YELLOW)
+        if kernel:
+            kernelSeed = int(self._rng.integers(2**31 - 64))
+            avg, best, probs, probsEx = kernel(
+                means, self.futureCreditsArr, float(self.pastPoints), float(self.pastTotalCredits),
+                float(self.profile.extraCredits), float(self.profile.extraGrade), targets, nSims, kernelSeed)
+        else:
+            avg, best, probs, probsEx = self._runNumpy(means, targets, nSims)
+        
+        # one plain dict per scenario, pandas was way too much import for five rows
+        results = []
+        for s, name in enumerate(names):
             row = {
                 "Scenario": name,
-                "Avg CGPA": np.mean(cgpaBase),
-                "Max Potential": np.max(cgpaBase)
+                "Avg CGPA": float(avg[s]),
+                "Max Potential": float(best[s])
             }
-            
-            # calculating probabilities of success vs despair
-            for t in self.profile.targets:
-                prob = np.mean(cgpaBase >= t) * 100
-                probEx = np.mean(cgpaEx >= t) * 100
-                row[f"P(>{t})"] = prob
-                row[f"P(>{t}) +Extra"] = probEx
-                
+            for i, t in enumerate(self.profile.targets):
+                row[f"P(>{t})"] = float(probs[s, i])
+                row[f"P(>{t}) +Extra"] = float(probsEx[s, i])
             results.append(row)
             
-        return pd.DataFrame(results)
+        return results
 
 # --- Main CLI ---
+def _printTable(rows, cols):
+    # right-aligned, 2 decimals for the numbers, basically what DataFrame.to_string used to do for us
+    cells = [[f"{r[c]:.2f}" if isinstance(r[c], float) else str(r[c]) for c in cols] for r in rows]
+    widths = [max(len(c), *(len(row[i]) for row in cells)) for i, c in enumerate(cols)]
+    print("  ".join(f"{c:>{w}}" for c, w in zip(cols, widths)))
+    for row in cells:
+        print("  ".join(f"{v:>{w}}" for v, w in zip(row, widths)))
+
 def main():
     parser = argparse.ArgumentParser(description="CGPA Predictor & Simulator")
     parser.add_argument("--reset", action="store_true", help="Reset configuration")
+    parser.add_argument("--numba", action="store_true",
+                        help="Use the multi-threaded numba kernel (only worth it on multi-core machines)")
     args = parser.parse_args()
 
     configFile = "cgpa_config.json"
@@ -226,39 +363,49 @@ def main():
     print(f"Credits Done: {sim.pastTotalCredits}")
     print(f"Current CGPA: {currCgpa:.4f}")
     
+    # nothing left to predict, so no point in firing up the simulation machinery
+    if sim.nFuture == 0:
+        Color.print("\nNo future semesters left, that CGPA is final. Congrats (or condolences).", Color.CYAN)
+        finalCgpaEx = (float(sim.pastPoints) + sim._extraPoints) / sim._totalCrEx
+        print(f"Final CGPA (with extra credits): {finalCgpaEx:.4f}")
+        
+        # plain scalar comparisons, the dice have nothing left to decide
+        Color.print("\nVerdicts:", Color.CYAN)
+        for t in profile.targets:
+            if finalCgpaEx >= t:
+                print(f"- Target {t}: {GREEN_FMT('Met')} (You did it)")
+            else:
+                print(f"- Target {t}: {RED_FMT('Not Met')} (Missed by {t - finalCgpaEx:.4f})")
+        return
+    
     # 2. Requirements Analysis
     Color.print("\n=== Required Average SGPA for Future Semesters ===", Color.BOLD)
     print(f"{'Target':<10} | {'Base Reqd':<12} | {'With Extra Credits':<18}")
     print("-" * 45)
-    for t in profile.targets:
-        req = sim.calculateRequiredAverage(t, False)
-        reqEx = sim.calculateRequiredAverage(t, True)
-        
-        rStr = f"{req:.4f}" if req <= 10 else f"{Color.RED}> 10.0{Color.END}"
-        exStr = f"{reqEx:.4f}" if reqEx <= 10 else f"{Color.RED}> 10.0{Color.END}"
-        
-        if req <= 10: rStr = f"{Color.GREEN}{rStr}{Color.END}"
-        if reqEx <= 10: exStr = f"{Color.GREEN}{exStr}{Color.END}"
+    reqs, reqsEx = sim.calculateRequiredAverages(profile.targets)
+    for t, req, reqEx in zip(profile.targets, reqs, reqsEx):
+        rStr = GREEN_FMT(f"{req:.4f}") if req <= 10 else OVER_TEN
+        exStr = GREEN_FMT(f"{reqEx:.4f}") if reqEx <= 10 else OVER_TEN
         
         print(f"{t:<10} | {rStr:<21} | {exStr:<29}")
 
     # 3. Simulation
-    df = sim.runMonteCarlo()
+    results = sim.runMonteCarlo(useKernel=args.numba)
     
     Color.print("\n=== Simulation Results ===", Color.BOLD)
     # cleaning up the table for viewing pleasure
-    cols = ["Scenario", "Avg CGPA"] + [c for c in df.columns if "P(>" in c]
-    print(df[cols].to_string(index=False, float_format="%.2f"))
+    cols = ["Scenario", "Avg CGPA"] + [c for c in results[0] if "P(>" in c]
+    _printTable(results, cols)
     
     Color.print("\nVerdicts:", Color.CYAN)
     for t in profile.targets:
-        maxProb = df[f"P(>{t}) +Extra"].max()
+        maxProb = max(r[f"P(>{t}) +Extra"] for r in results)
         if maxProb < 1:
-            print(f"- Target {t}: {Color.RED}Impossible/Highly Unlikely{Color.END} (Max Prob: {maxProb:.1f}%)")
+            print(f"- Target {t}: {RED_FMT('Impossible/Highly Unlikely')} (Max Prob: {maxProb:.1f}%)")
         elif maxProb < 50:
-            print(f"- Target {t}: {Color.YELLOW}Difficult{Color.END} (Need to sweat significantly)")
+            print(f"- Target {t}: {YELLOW_FMT('Difficult')} (Need to sweat significantly)")
         else:
-            print(f"- Target {t}: {Color.GREEN}Achievable{Color.END} (You got this)")
+            print(f"- Target {t}: {GREEN_FMT('Achievable')} (You got this)")
 
 if __name__ == "__main__":
     try: